@@ -0,0 +1,191 @@
+"""Power-aware frame-rate governor for repaint and motion work."""
+import ctypes
+import time
+from collections import deque
+from typing import Dict, Any
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+
+class SYSTEM_POWER_STATUS(ctypes.Structure):
+    """Windows SYSTEM_POWER_STATUS structure."""
+    _fields_ = [
+        ('ACLineStatus', ctypes.c_ubyte),
+        ('BatteryFlag', ctypes.c_ubyte),
+        ('BatteryLifePercent', ctypes.c_ubyte),
+        ('SystemStatusFlag', ctypes.c_ubyte),
+        ('BatteryLifeTime', ctypes.c_ulong),
+        ('BatteryFullLifeTime', ctypes.c_ulong)
+    ]
+
+
+class FrameGovernor(QObject):
+    """Caps how often repaint and motion work runs, based on power state.
+
+    Callers hand work to ``schedule`` under a key. If the key ran less than
+    one frame ago the work is deferred to the next frame, and newer work
+    for the same key replaces older pending work, so bursts of input
+    events collapse into at most one update per frame.
+    """
+
+    # Power modes selectable by the user
+    MODE_AUTO = 'auto'
+    MODE_PERFORMANCE = 'performance'
+    MODE_POWER_SAVER = 'power_saver'
+    MODES = (MODE_AUTO, MODE_PERFORMANCE, MODE_POWER_SAVER)
+
+    # Effective policies
+    POLICIES = {
+        MODE_PERFORMANCE: {
+            'max_fps': 120,
+            'save_delay_ms': 250,
+            'plugin_layers': True,
+            'log_flush_interval_ms': 5000
+        },
+        MODE_POWER_SAVER: {
+            'max_fps': 30,
+            'save_delay_ms': 2000,
+            'plugin_layers': False,
+            'log_flush_interval_ms': 30000
+        }
+    }
+
+    POWER_POLL_INTERVAL_MS = 30000
+    BURST_GAP = 0.25  # Seconds without updates that end a burst
+
+    # Emitted with the effective policy name when it changes
+    policy_changed = pyqtSignal(str)
+
+    def __init__(self, mode=MODE_AUTO):
+        super().__init__()
+        self.mode = mode if mode in self.MODES else self.MODE_AUTO
+        self.on_battery = False
+        self.policy_name = self.MODE_PERFORMANCE
+
+        self.last_run = {}
+        self.pending = {}
+        self.run_times = deque(maxlen=1024)  # (time, key) of recent runs
+        self.bursts = {}  # key -> [start, last run, runs] of its latest burst
+
+        self.power_timer = QTimer(self)
+        self.power_timer.timeout.connect(self.refresh_power_state)
+        self.power_timer.start(self.POWER_POLL_INTERVAL_MS)
+        self.refresh_power_state()
+
+    def detect_battery(self) -> bool:
+        """Return True when running on battery or with battery saver on."""
+        try:
+            status = SYSTEM_POWER_STATUS()
+            if not ctypes.windll.kernel32.GetSystemPowerStatus(ctypes.byref(status)):
+                return False
+            # ACLineStatus 0 = offline; SystemStatusFlag 1 = battery saver on
+            return status.ACLineStatus == 0 or status.SystemStatusFlag == 1
+        except Exception:
+            # Not on Windows or no power information; assume mains power
+            return False
+
+    def refresh_power_state(self):
+        """Re-read the power state and update the effective policy."""
+        self.on_battery = self.detect_battery()
+        self._update_policy()
+
+    def set_mode(self, mode):
+        """Set the user's power mode: auto, performance or power_saver."""
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown power mode: {mode}")
+        self.mode = mode
+        self._update_policy()
+
+    def _update_policy(self):
+        """Resolve the mode to a policy and announce changes."""
+        if self.mode == self.MODE_AUTO:
+            name = self.MODE_POWER_SAVER if self.on_battery else self.MODE_PERFORMANCE
+        else:
+            name = self.mode
+
+        if name != self.policy_name:
+            self.policy_name = name
+            self.policy_changed.emit(name)
+
+    @property
+    def policy(self) -> Dict[str, Any]:
+        """Return the values of the effective policy."""
+        return self.POLICIES[self.policy_name]
+
+    def frame_interval(self) -> float:
+        """Minimum time between two runs of the same key, in seconds."""
+        return 1.0 / self.policy['max_fps']
+
+    def frame_interval_ms(self) -> int:
+        """Frame interval in whole milliseconds, for timers."""
+        return max(1, int(round(self.frame_interval() * 1000)))
+
+    def schedule(self, key, callback):
+        """Run callback now if the frame budget allows, otherwise on the next frame."""
+        now = time.monotonic()
+        since_last = now - self.last_run.get(key, 0.0)
+        interval = self.frame_interval()
+
+        if since_last >= interval and key not in self.pending:
+            self._run(key, callback, now)
+            return
+
+        first = key not in self.pending
+        self.pending[key] = callback
+        if first:
+            delay_ms = int(max(0.0, interval - since_last) * 1000) + 1
+            QTimer.singleShot(delay_ms, lambda: self.flush(key))
+
+    def flush(self, key):
+        """Run pending work for key immediately, if any."""
+        callback = self.pending.pop(key, None)
+        if callback:
+            self._run(key, callback, time.monotonic())
+
+    def _run(self, key, callback, now):
+        """Run callback and record the update."""
+        self.last_run[key] = now
+        self.run_times.append((now, key))
+        burst = self.bursts.get(key)
+        if burst is None or now - burst[1] > self.BURST_GAP:
+            self.bursts[key] = [now, now, 1]
+        else:
+            burst[1] = now
+            burst[2] += 1
+        callback()
+
+    def rates(self) -> Dict[str, float]:
+        """Updates per second for each key over the last second."""
+        cutoff = time.monotonic() - 1.0
+        counts = {}
+        for t, key in self.run_times:
+            if t >= cutoff:
+                counts[key] = counts.get(key, 0) + 1
+        return {key: float(count) for key, count in counts.items()}
+
+    def burst_rates(self) -> Dict[str, float]:
+        """Average updates per second of the latest burst of each key.
+
+        Unlike ``rates`` this still reports a drag or resize after it ended,
+        e.g. when the user opens the tray menu.
+        """
+        rates = {}
+        for key, (start, last, runs) in self.bursts.items():
+            if runs > 1 and last > start:
+                rates[key] = (runs - 1) / (last - start)
+        return rates
+
+    def actual_rate(self) -> float:
+        """Rate of the busiest update path, comparable to max_fps."""
+        return max(self.rates().values(), default=0.0)
+
+    def get_status(self) -> Dict[str, Any]:
+        """Return the active policy and update rate for display."""
+        return {
+            'mode': self.mode,
+            'policy': self.policy_name,
+            'on_battery': self.on_battery,
+            'max_fps': self.policy['max_fps'],
+            'actual_fps': self.actual_rate(),
+            'rates': self.rates(),
+            'burst_rates': self.burst_rates()
+        }
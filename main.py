@@ -12,6 +12,10 @@ from ruler_window import RulerWindow
 from overlay_window import OverlayWindow
 from hotkey_manager import HotkeyManager
 from tray_icon import TrayIcon
+from session_logger import SessionLogger
+from render_plugins import RenderPluginManager
+from window_animator import WindowAnimator
+from frame_governor import FrameGovernor
 
 
 class TextRulerApp:
@@ -32,6 +36,30 @@ class TextRulerApp:
         # Connect ruler to overlay
         self.ruler_window.set_overlay_window(self.overlay_window)
         
+        # Extra decoration layers; register RenderPlugin subclasses here
+        self.render_plugins = RenderPluginManager()
+        self.ruler_window.set_render_plugins(self.render_plugins)
+        self.overlay_window.set_render_plugins(self.render_plugins)
+        self.render_plugins.plugin_state_changed.connect(self.on_plugin_state_changed)
+        
+        # Fade and slide animations
+        self.animator = WindowAnimator(self.settings.get_animations_enabled())
+        self.ruler_window.set_animator(self.animator)
+        self.overlay_window.set_animator(self.animator)
+        
+        # Frame-rate governor for drag and repaint paths
+        self.governor = FrameGovernor(self.settings.get_power_mode())
+        self.ruler_window.set_governor(self.governor)
+        self.overlay_window.set_governor(self.governor)
+        self.governor.policy_changed.connect(self.apply_power_policy)
+        
+        # Optional reading-session logging
+        self.session_logger = None
+        if self.settings.get_session_log_enabled():
+            self.start_session_logger()
+        
+        self.apply_power_policy()
+        
         # Create hotkey manager
         self.hotkey_manager = HotkeyManager()
         self.hotkey_manager.toggle_ruler.connect(self.toggle_ruler)
@@ -48,36 +76,132 @@ class TextRulerApp:
         self.tray_icon.exit_requested.connect(self.exit_app)
         self.tray_icon.ruler_color_changed.connect(self.on_ruler_color_changed)
         self.tray_icon.overlay_color_changed.connect(self.on_overlay_color_changed)
+        self.tray_icon.power_mode_changed.connect(self.on_power_mode_changed)
+        self.tray_icon.power_status_provider = self.governor.get_status
+        
+        # Apply changes made by other instances or scripts
+        self.settings.settings_changed.connect(self.on_settings_changed)
     
     def toggle_ruler(self):
         """Toggle ruler visibility."""
         self.ruler_window.toggle_visibility()
-        self.tray_icon.update_ruler_state(self.ruler_window.isVisible())
+        # The window may still be fading, so report the requested state
+        self.tray_icon.update_ruler_state(self.settings.get_ruler_visible())
         
-        # Update overlay if visible
+        # Update overlay cutout if visible
         if self.overlay_window.isVisible():
-            self.overlay_window.update()
+            self.overlay_window.update_ruler_position()
     
     def toggle_overlay(self):
         """Toggle overlay visibility."""
         self.overlay_window.toggle_visibility()
-        self.tray_icon.update_overlay_state(self.overlay_window.isVisible())
+        self.tray_icon.update_overlay_state(self.settings.get_overlay_visible())
     
     def on_ruler_color_changed(self, color):
         """Handle ruler color change."""
         self.settings.set_ruler_color(color)
-        self.ruler_window.update()
+        self.ruler_window.request_repaint()
         self.tray_icon.update_ruler_color(color)
     
     def on_overlay_color_changed(self, color):
         """Handle overlay color change."""
         self.settings.set_overlay_color(color)
-        self.overlay_window.update()
+        self.overlay_window.refresh()
         self.tray_icon.update_overlay_color(color)
     
+    def on_power_mode_changed(self, mode):
+        """Handle power mode change from the tray menu."""
+        self.settings.set_power_mode(mode)
+        self.governor.set_mode(mode)
+    
+    def start_session_logger(self):
+        """Start logging the reading session, if it is not already logged."""
+        if self.session_logger:
+            return
+        self.session_logger = SessionLogger(
+            self.settings.get_session_log_file(),
+            capacity=self.settings.get_session_log_buffer_size(),
+            max_bytes=self.settings.get_session_log_max_bytes(),
+            line_height=self.settings.get_ruler_height()
+        )
+        self.ruler_window.set_session_logger(self.session_logger)
+        self.overlay_window.set_session_logger(self.session_logger)
+    
+    def stop_session_logger(self):
+        """Stop logging the reading session and write what is pending."""
+        if not self.session_logger:
+            return
+        self.session_logger.close()
+        self.session_logger = None
+        self.ruler_window.set_session_logger(None)
+        self.overlay_window.set_session_logger(None)
+    
+    def apply_power_policy(self, policy_name=None):
+        """Apply the governor's active policy to timers and optional work."""
+        policy = self.governor.policy
+        self.settings.set_save_delay(policy['save_delay_ms'])
+        self.animator.set_frame_interval(self.governor.frame_interval_ms())
+        paused = not policy['plugin_layers']
+        if paused != self.render_plugins.paused:
+            # Optional decorations are paused on battery and resumed on AC
+            self.render_plugins.set_paused(paused)
+            self.ruler_window.request_repaint()
+            self.overlay_window.refresh()
+        if self.session_logger:
+            self.session_logger.set_flush_interval(policy['log_flush_interval_ms'])
+    
+    def on_settings_changed(self, paths):
+        """Apply externally changed settings, repainting only what they affect."""
+        # Collapse per-color paths like 'ruler.opacity_by_color.Red' to their field
+        fields = {path.rsplit('.', 1)[0] if path.count('.') > 1 else path for path in paths}
+        
+        if fields & {'ruler.height', 'ruler.x_position', 'ruler.y_position'}:
+            self.ruler_window.apply_geometry()
+            self.overlay_window.update_ruler_position()
+        if 'ruler.visible' in fields:
+            visible = self.settings.get_ruler_visible()
+            if visible != self.ruler_window.isVisible():
+                self.ruler_window.apply_visibility(visible)
+            self.tray_icon.update_ruler_state(visible)
+        if fields & {'ruler.color', 'ruler.opacity_by_color'}:
+            self.ruler_window.request_repaint()
+            self.tray_icon.update_ruler_color(self.settings.get_ruler_color())
+        
+        if 'overlay.visible' in fields:
+            visible = self.settings.get_overlay_visible()
+            if visible != self.overlay_window.isVisible():
+                self.overlay_window.apply_visibility(visible)
+            self.tray_icon.update_overlay_state(visible)
+        if fields & {'overlay.color', 'overlay.opacity_by_color'}:
+            self.overlay_window.refresh()
+            self.tray_icon.update_overlay_color(self.settings.get_overlay_color())
+        
+        if 'power.mode' in fields:
+            self.governor.set_mode(self.settings.get_power_mode())
+            self.tray_icon.update_power_mode(self.settings.get_power_mode())
+        if 'animations.enabled' in fields:
+            self.animator.enabled = self.settings.get_animations_enabled()
+        if 'session_log.enabled' in fields:
+            if self.settings.get_session_log_enabled():
+                self.start_session_logger()
+                self.apply_power_policy()
+            else:
+                self.stop_session_logger()
+        # overlay.shaped_window, hotkeys and the session log's buffer and file
+        # sizes are read at startup and take effect after a restart
+    
+    def on_plugin_state_changed(self, name, state):
+        """Repaint after the watchdog degrades or disables a plugin."""
+        print(f"Render plugin {name} is now {state}")
+        self.ruler_window.request_repaint()
+        self.overlay_window.refresh()
+    
     def exit_app(self):
         """Exit the application."""
         self.hotkey_manager.stop()
+        self.settings.flush()
+        if self.session_logger:
+            self.session_logger.close()
         self.app.quit()
     
     def run(self):
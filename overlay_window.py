@@ -10,13 +10,65 @@ WS_EX_LAYERED = 0x00080000
 GWL_EXSTYLE = -20
 
 
+def paint_overlay(painter, rect, color_hex, opacity, cutout=None):
+    """Paint the overlay fill into rect, leaving the cutout rect unpainted."""
+    color = QColor(color_hex)
+    color.setAlphaF(opacity)
+    
+    # Create a path for the entire window
+    full_path = QPainterPath()
+    full_path.addRect(QRectF(rect))
+    
+    if cutout is not None:
+        cutout_path = QPainterPath()
+        cutout_path.addRect(
+            cutout.x(),
+            cutout.y(),
+            cutout.width(),
+            cutout.height()
+        )
+        
+        # Subtract cutout from full path
+        painter.fillPath(full_path.subtracted(cutout_path), color)
+    else:
+        # No cutout needed if ruler is hidden
+        painter.fillPath(full_path, color)
+
+
+def paint_overlay_shaped(painter, rect, color_hex):
+    """Paint the opaque overlay fill used with a shaped, translucent window."""
+    painter.fillRect(rect, QColor(color_hex))
+
+
+def overlay_mask(rect, cutout=None):
+    """Return the window region for a shaped overlay: rect minus the cutout."""
+    region = QRegion(rect)
+    if cutout is not None:
+        region = region.subtracted(QRegion(cutout))
+    return region
+
+
 class OverlayWindow(QWidget):
-    """Full-screen overlay with cutout for ruler."""
+    """Full-screen overlay with cutout for ruler.
+    
+    By default the overlay paints a per-pixel translucent fill. With
+    overlay.shaped_window set to true it is a shaped window instead: it
+    paints an opaque fill, gets its dimming from the window opacity and
+    cuts out the ruler with a native window region. This avoids alpha
+    blending a desktop-sized buffer, but every ruler move then changes the
+    native region of a desktop-sized layered window, so it is opt-in.
+    """
     
     def __init__(self, settings, ruler_window):
         super().__init__()
         self.settings = settings
         self.ruler_window = ruler_window
+        self.session_logger = None  # Optional, set by main app
+        self.render_plugins = None  # Optional, set by main app
+        self.animator = None  # Optional, set by main app
+        self.governor = None  # Optional, set by main app
+        self.shaped = settings.get_overlay_shaped()
+        self.painted_cutout = None  # Cutout as of the last paint
         
         self.init_ui()
         self.load_settings()
@@ -31,8 +83,13 @@ class OverlayWindow(QWidget):
             Qt.WindowTransparentForInput  # Qt's way of saying click-through
         )
         
-        # Enable transparency
-        self.setAttribute(Qt.WA_TranslucentBackground)
+        if self.shaped:
+            # Opaque fill every paint; window opacity does the dimming
+            self.setAttribute(Qt.WA_OpaquePaintEvent)
+            self.setAttribute(Qt.WA_NoSystemBackground)
+        else:
+            # Enable transparency
+            self.setAttribute(Qt.WA_TranslucentBackground)
         self.setAttribute(Qt.WA_TransparentForMouseEvents)
         
         # Make window cover all screens
@@ -61,6 +118,8 @@ class OverlayWindow(QWidget):
     def load_settings(self):
         """Load and apply settings."""
         if self.settings.get_overlay_visible():
+            self.setWindowOpacity(self.window_opacity())
+            self.update_mask()
             self.show()
             self.set_click_through()  # Re-apply when showing
         else:
@@ -76,44 +135,136 @@ class OverlayWindow(QWidget):
         color_hex = self.settings.get_color_hex(color_name)
         opacity = self.settings.get_overlay_opacity(color_name)
         
-        color = QColor(color_hex)
-        color.setAlphaF(opacity)
-        
-        # Create a path for the entire window
-        full_path = QPainterPath()
-        full_path.addRect(QRectF(self.rect()))
+        cutout = self.ruler_cutout()
+        self.painted_cutout = cutout
+        if self.shaped:
+            # Cutout is handled by the window mask; fill only what is exposed
+            paint_overlay_shaped(painter, event.rect(), color_hex)
+        else:
+            # Only the updated area needs filling; Qt clips to it anyway
+            paint_overlay(painter, event.rect(), color_hex, opacity, cutout)
         
-        # Create cutout path for ruler area
+        # Extra decoration layers
+        if self.render_plugins and self.render_plugins.has_plugins('overlay'):
+            context = {
+                'color': color_name,
+                'color_hex': color_hex,
+                'opacity': opacity,
+                'width': self.width(),
+                'height': self.height(),
+                'cutout': cutout
+            }
+            self.render_plugins.paint_layers('overlay', painter, self.rect(), context)
+    
+    def ruler_cutout(self):
+        """Return the ruler geometry in overlay coordinates, or None if hidden."""
         if self.ruler_window and self.ruler_window.isVisible():
-            ruler_rect = self.ruler_window.geometry()
-            cutout_path = QPainterPath()
-            cutout_path.addRect(
-                ruler_rect.x(),
-                ruler_rect.y(),
-                ruler_rect.width(),
-                ruler_rect.height()
-            )
-            
-            # Subtract cutout from full path
-            final_path = full_path.subtracted(cutout_path)
-            painter.fillPath(final_path, color)
+            return self.ruler_window.geometry().translated(-self.x(), -self.y())
+        return None
+    
+    def window_opacity(self):
+        """Return the window opacity for the current color."""
+        if self.shaped:
+            return self.settings.get_overlay_opacity()
+        return 1.0
+    
+    def update_mask(self):
+        """Cut the ruler out of a shaped overlay's window region."""
+        if not self.shaped:
+            return
+        cutout = self.ruler_cutout()
+        if cutout is not None:
+            self.setMask(overlay_mask(self.rect(), cutout))
         else:
-            # No cutout needed if ruler is hidden
-            painter.fillPath(full_path, color)
+            self.clearMask()
+    
+    def repaint_cutout(self):
+        """Repaint only where the cutout was last painted and where it is now."""
+        # Plugins may draw around the cutout (e.g. an edge glow)
+        margin = 0
+        if self.render_plugins:
+            margin = self.render_plugins.cutout_margin('overlay')
+        
+        region = QRegion()
+        for rect in (self.painted_cutout, self.ruler_cutout()):
+            if rect is not None:
+                region = region.united(QRegion(rect.adjusted(-margin, -margin, margin, margin)))
+        if not region.isEmpty():
+            self.update(region)
+    
+    def update_shape(self):
+        """Move the cutout of a shaped overlay, repainting plugin layers around it."""
+        self.update_mask()
+        if self.render_plugins and self.render_plugins.has_plugins('overlay'):
+            self.repaint_cutout()
     
     def update_ruler_position(self):
         """Called when ruler moves or resizes."""
-        self.update()
+        # A shaped overlay only changes its region; Qt repaints what is uncovered
+        refresh = self.update_shape if self.shaped else self.repaint_cutout
+        if self.governor:
+            self.governor.schedule('overlay_repaint', refresh)
+        else:
+            refresh()
+    
+    def refresh(self):
+        """Apply color and opacity changes."""
+        if not (self.animator and self.animator.is_fading(self)):
+            self.setWindowOpacity(self.window_opacity())
+        if self.governor:
+            self.governor.schedule('overlay_refresh', self.update)
+        else:
+            self.update()
     
     def toggle_visibility(self):
         """Toggle overlay visibility."""
-        if self.isVisible():
-            self.hide()
-            self.settings.set_overlay_visible(False)
+        if self.animator:
+            visible = not self.animator.target_visible(self)
         else:
-            self.show()
-            self.settings.set_overlay_visible(True)
-            self.set_click_through()
+            visible = not self.isVisible()
+        
+        self.apply_visibility(visible)
+        self.settings.set_overlay_visible(visible)
+        
+        if self.session_logger:
+            if visible:
+                event = self.session_logger.EVENT_OVERLAY_SHOWN
+            else:
+                event = self.session_logger.EVENT_OVERLAY_HIDDEN
+            self.session_logger.record(event)
+    
+    def apply_visibility(self, visible):
+        """Show or hide the overlay, fading when an animator is set."""
+        opacity = self.window_opacity()
+        if visible:
+            self.update_mask()
             self.update()
+            if self.animator:
+                # Window-level fade; the content is painted once
+                self.animator.fade(self, True, opacity)
+            else:
+                self.setWindowOpacity(opacity)
+                self.show()
+            self.set_click_through()
+        elif self.animator:
+            self.animator.fade(self, False, opacity)
+        else:
+            self.hide()
+    
+    def set_session_logger(self, session_logger):
+        """Set the optional reading-session logger."""
+        self.session_logger = session_logger
+    
+    def set_render_plugins(self, render_plugins):
+        """Set the manager for extra decoration layers."""
+        self.render_plugins = render_plugins
+    
+    def set_animator(self, animator):
+        """Set the animator used for fading in and out."""
+        self.animator = animator
+    
+    def set_governor(self, governor):
+        """Set the frame-rate governor for cutout repaints."""
+        self.governor = governor
     
     # Note: wheelEvent removed as it won't work with click-through enabled
@@ -0,0 +1,491 @@
+"""
+Golden-image rendering check for the ruler and overlay.
+
+Renders the ruler and the real OverlayWindow into QImages for a matrix of
+colors, opacities, ruler positions and screen layouts, and compares them
+against stored golden images with a per-pixel tolerance. The overlay is
+painted through its own paintEvent with a stand-in ruler, so the cutout
+comes from OverlayWindow.ruler_cutout. The shaped overlay is composited
+the way the window system shows it (opaque fill, window opacity, window
+mask) and must match the same golden images as the translucent overlay.
+
+Every overlay case is also rendered after a ruler move, repainting only
+the region the overlay asks to be updated, which checks partial repaints
+and the plugin layers around the cutout.
+
+Usage:
+    python render_check.py            # Compare against golden images
+    python render_check.py --update   # Regenerate golden images
+    python render_check.py --bench    # Time overlay paint and mask updates at 200% scaling
+
+Runs headless (offscreen Qt platform). Requires NumPy, which is only
+needed for this development check and not for the application itself.
+"""
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtWidgets import QApplication, QWidget
+from PyQt5.QtCore import Qt, QRect, QRectF
+from PyQt5.QtGui import QImage, QPainter, QColor, QRegion, QPainterPath
+
+from settings import AppSettings
+from ruler_window import paint_ruler
+from overlay_window import OverlayWindow, paint_overlay, paint_overlay_shaped
+from render_plugins import RenderPlugin, RenderPluginManager
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+GOLDEN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'golden')
+DIFF_DIR = os.path.join(GOLDEN_DIR, 'diffs')
+
+# Screen layouts at 1/10 scale, so the whole matrix stays small and fast.
+# The ruler sits on the first screen; in 'left_of_primary' that screen has a
+# negative origin, so the cutout must be translated into overlay coordinates.
+LAYOUTS = {
+    'single': [QRect(0, 0, 192, 108)],
+    'side_by_side': [QRect(0, 0, 192, 108), QRect(192, 0, 192, 108)],
+    'stacked_mixed': [QRect(0, 0, 256, 144), QRect(32, 144, 192, 108)],
+    'left_of_primary': [QRect(-192, 18, 192, 108), QRect(0, 0, 256, 144)]
+}
+OPACITIES = (0.2, 0.5, 0.9)
+RULER_HEIGHT = 5
+RULER_Y_FRACTIONS = (0.0, 0.5, 0.95)
+
+# Maximum allowed difference per channel, and share of pixels allowed to exceed it
+CHANNEL_TOLERANCE = 2
+MAX_BAD_PIXEL_RATIO = 0.0
+
+RENDER_FLAGS = QWidget.RenderFlags(QWidget.DrawChildren)
+
+
+class CheckSettings:
+    """Fixed overlay settings, changed by the check between cases."""
+
+    def __init__(self, shaped):
+        self.shaped = shaped
+        self.color = 'Black'
+        self.opacity = 0.5
+
+    def get_overlay_color(self):
+        return self.color
+
+    def get_overlay_opacity(self, color=None):
+        return self.opacity
+
+    def get_overlay_shaped(self):
+        return self.shaped
+
+    def get_overlay_visible(self):
+        return False
+
+    def get_color_hex(self, color_name):
+        return AppSettings.COLORS[color_name]
+
+
+class CheckRuler:
+    """Stands in for the ruler window: a global geometry, or None when hidden."""
+
+    def __init__(self):
+        self.rect = None
+
+    def isVisible(self):
+        return self.rect is not None
+
+    def geometry(self):
+        return QRect(self.rect)
+
+
+class CheckOverlay(OverlayWindow):
+    """The real overlay, recording update requests instead of scheduling paints."""
+
+    def __init__(self, shaped, render_plugins=None):
+        super().__init__(CheckSettings(shaped), CheckRuler())
+        self.requested = QRegion()
+        if render_plugins:
+            self.set_render_plugins(render_plugins)
+
+    def set_click_through(self):
+        pass  # Windows only
+
+    def update(self, *args):
+        self.requested = self.requested.united(QRegion(args[0]) if args else QRegion(self.rect()))
+
+
+class CutoutFrame(RenderPlugin):
+    """Overlay plugin drawing a frame around the ruler cutout."""
+
+    name = 'cutout_frame'
+    target = 'overlay'
+    cutout_margin = 2
+    budget_ms = 1000.0  # Timing varies by machine; never degrade during the check
+
+    def paint(self, painter, rect, context):
+        # The layer is the cutout grown by the margin
+        margin = self.cutout_margin
+        frame = QPainterPath()
+        frame.setFillRule(Qt.OddEvenFill)
+        frame.addRect(QRectF(rect))
+        frame.addRect(QRectF(rect.adjusted(margin, margin, -margin, -margin)))
+        painter.fillPath(frame, QColor('#FFFFFF'))
+
+
+def new_image(width, height):
+    """Create a cleared ARGB image of the given size."""
+    image = QImage(width, height, QImage.Format_ARGB32_Premultiplied)
+    image.fill(QColor(0, 0, 0, 0))
+    return image
+
+
+def render_ruler(screen, color_hex, opacity):
+    """Render the ruler as it appears across the given screen."""
+    image = new_image(screen.width(), RULER_HEIGHT)
+    painter = QPainter(image)
+    painter.setRenderHint(QPainter.Antialiasing)
+    paint_ruler(painter, image.rect(), color_hex, opacity)
+    painter.end()
+    return image
+
+
+def overlay_geometry(screens):
+    """Return the overlay geometry: the union of all screens."""
+    geometry = QRect()
+    for screen in screens:
+        geometry = geometry.united(screen)
+    return geometry
+
+
+def make_overlays():
+    """Create one check overlay per (shaped, with plugin) combination."""
+    overlays = {}
+    for shaped in (False, True):
+        overlays[shaped, False] = CheckOverlay(shaped)
+        plugins = RenderPluginManager()
+        plugins.register(CutoutFrame())
+        overlays[shaped, True] = CheckOverlay(shaped, plugins)
+    return overlays
+
+
+def setup_overlay(overlay, screens, color_name, opacity, ruler_rect):
+    """Place the overlay over the screens and apply the case's settings."""
+    overlay.setGeometry(overlay_geometry(screens))
+    overlay.settings.color = color_name
+    overlay.settings.opacity = opacity
+    overlay.ruler_window.rect = ruler_rect
+    overlay.refresh()
+    overlay.update_mask()
+    overlay.requested = QRegion()
+
+
+def new_backing_store(overlay):
+    """Create the buffer the overlay paints into: opaque when shaped."""
+    if overlay.shaped:
+        image = QImage(overlay.width(), overlay.height(), QImage.Format_RGB32)
+        image.fill(QColor(255, 0, 255))  # Unpainted pixels show up as magenta
+        return image
+    return new_image(overlay.width(), overlay.height())
+
+
+def paint_window(overlay, buffer, region=None):
+    """Run the overlay's paintEvent into buffer for the whole window or only region."""
+    if region is None:
+        region = QRegion(overlay.rect())
+    elif not overlay.shaped:
+        # Qt clears translucent backing stores before repainting them
+        painter = QPainter(buffer)
+        painter.setCompositionMode(QPainter.CompositionMode_Source)
+        painter.setClipRegion(region)
+        painter.fillRect(buffer.rect(), QColor(0, 0, 0, 0))
+        painter.end()
+    # Painting is clipped to the window mask, and render() places the top
+    # left of what is painted at the target offset
+    region = region.intersected(window_region(overlay))
+    if not region.isEmpty():
+        overlay.render(buffer, region.boundingRect().topLeft(), region, RENDER_FLAGS)
+
+
+def window_region(overlay):
+    """Return the visible region of the overlay window."""
+    mask = overlay.mask()
+    return QRegion(overlay.rect()) if mask.isEmpty() else mask
+
+
+def composite(overlay, buffer):
+    """Return the overlay as the window system shows it."""
+    if not overlay.shaped:
+        return buffer
+    image = new_image(overlay.width(), overlay.height())
+    painter = QPainter(image)
+    painter.setOpacity(overlay.windowOpacity())
+    painter.setClipRegion(window_region(overlay))
+    painter.drawImage(0, 0, buffer)
+    painter.end()
+    return image
+
+
+def render_overlay(overlay, screens, color_name, opacity, ruler_rect):
+    """Render the overlay spanning all screens with an optional global ruler cutout."""
+    setup_overlay(overlay, screens, color_name, opacity, ruler_rect)
+    buffer = new_backing_store(overlay)
+    paint_window(overlay, buffer)
+    return composite(overlay, buffer)
+
+
+def render_overlay_moved(overlay, screens, color_name, opacity, from_rect, ruler_rect):
+    """Render with the ruler at from_rect, move it and repaint only what is updated."""
+    setup_overlay(overlay, screens, color_name, opacity, from_rect)
+    buffer = new_backing_store(overlay)
+    paint_window(overlay, buffer)
+    old_region = window_region(overlay)
+
+    overlay.ruler_window.rect = ruler_rect
+    overlay.update_ruler_position()
+    region = overlay.requested
+    if overlay.shaped:
+        # The window system exposes what the new window region uncovers
+        region = region.united(window_region(overlay).subtracted(old_region))
+    paint_window(overlay, buffer, region)
+    return composite(overlay, buffer)
+
+
+def ruler_positions(screen):
+    """Return [(suffix, global ruler rect or None)] for the ruler on screen."""
+    positions = [('hidden', None)]
+    for fraction in RULER_Y_FRACTIONS:
+        y = screen.y() + int(screen.height() * fraction)
+        positions.append((f"y{int(fraction * 100)}",
+                          QRect(screen.x(), y, screen.width(), RULER_HEIGHT)))
+    return positions
+
+
+def iter_overlay_cases(overlays, name, screens, color_name, opacity, positions, index, plugin):
+    """Yield the full and moved renders of one overlay golden in both modes.
+
+    Without plugins both modes must match one golden; plugin layers are
+    composited differently when shaped, so each mode then has its own.
+    """
+    suffix, ruler_rect = positions[index]
+    from_rect = positions[index - 1][1]  # Arrive from the previous position
+    for shaped, mode in ((False, 'translucent'), (True, 'shaped')):
+        overlay = overlays[shaped, plugin]
+        golden = f"{name}_{mode}" if plugin else name
+        yield (golden, mode, not (shaped and not plugin),
+               lambda o=overlay, r=ruler_rect: render_overlay(o, screens, color_name, opacity, r))
+        yield (golden, f"{mode}_moved", False,
+               lambda o=overlay, f=from_rect, r=ruler_rect:
+               render_overlay_moved(o, screens, color_name, opacity, f, r))
+
+
+def iter_cases(overlays):
+    """Yield (golden name, label, is reference, render callable) for the whole matrix."""
+    for layout_name, screens in LAYOUTS.items():
+        first = screens[0]
+        positions = ruler_positions(first)
+        for color_name, color_hex in AppSettings.COLORS.items():
+            for opacity in OPACITIES:
+                tag = f"{layout_name}_{color_name}_{int(opacity * 100)}"
+                yield (f"ruler_{tag}", 'ruler', True,
+                       lambda s=first, c=color_hex, o=opacity: render_ruler(s, c, o))
+                for index, (suffix, _) in enumerate(positions):
+                    yield from iter_overlay_cases(overlays, f"overlay_{tag}_{suffix}", screens,
+                                                  color_name, opacity, positions, index, False)
+        for index, (suffix, _) in enumerate(positions):
+            yield from iter_overlay_cases(overlays, f"plugin_{layout_name}_{suffix}", screens,
+                                          'Black', 0.5, positions, index, True)
+
+
+def image_to_array(image):
+    """View a QImage as a (height, width, 4) uint8 array."""
+    image = image.convertToFormat(QImage.Format_ARGB32_Premultiplied)
+    ptr = image.constBits()
+    ptr.setsize(image.sizeInBytes())
+    array = np.frombuffer(ptr, dtype=np.uint8).reshape(image.height(), image.bytesPerLine())
+    return array[:, :image.width() * 4].reshape(image.height(), image.width(), 4).copy()
+
+
+def write_heatmap(diff, path):
+    """Write the per-pixel maximum channel difference as a red heatmap."""
+    height, width = diff.shape
+    heat = np.zeros((height, width, 4), dtype=np.uint8)
+    scaled = np.clip(diff.astype(np.uint16) * 8, 0, 255).astype(np.uint8)
+    heat[..., 2] = scaled   # Red (BGRA byte order)
+    heat[..., 3] = 255
+    image = QImage(heat.data, width, height, width * 4, QImage.Format_ARGB32)
+    image.save(path)
+
+
+def compare(name, image, label):
+    """Compare a rendered image to its golden.
+
+    Returns (error string or None, heatmap path or None).
+    """
+    golden_path = os.path.join(GOLDEN_DIR, f"{name}.png")
+    if not os.path.exists(golden_path):
+        return "missing golden image", None
+
+    actual = image_to_array(image)
+    expected = image_to_array(QImage(golden_path))
+    if actual.shape != expected.shape:
+        return f"size {actual.shape[:2]} != golden {expected.shape[:2]}", None
+
+    diff = np.abs(actual.astype(np.int16) - expected.astype(np.int16)).max(axis=2)
+    bad_ratio = np.count_nonzero(diff > CHANNEL_TOLERANCE) / diff.size
+    if bad_ratio > MAX_BAD_PIXEL_RATIO:
+        os.makedirs(DIFF_DIR, exist_ok=True)
+        heatmap_path = os.path.join(DIFF_DIR, f"{name}_{label}_diff.png")
+        write_heatmap(diff, heatmap_path)
+        return f"{bad_ratio:.2%} pixels differ (max {int(diff.max())})", heatmap_path
+    return None, None
+
+
+def time_paint(image, paint, repeats):
+    """Return the mean time in ms of painting into image."""
+    start = time.perf_counter()
+    for _ in range(repeats):
+        painter = QPainter(image)
+        paint(painter)
+        painter.end()
+    return (time.perf_counter() - start) * 1000.0 / repeats
+
+
+def bench(repeats=10):
+    """Compare overlay paint cost of the translucent and shaped paths.
+
+    Uses two 2560x1440 screens at 200% scaling, rendered into images the
+    size of Qt's device-pixel backing store. The shaped path also changes
+    the window mask on every ruler move, which is timed on a real shaped
+    OverlayWindow; it only reaches the native window region (SetWindowRgn)
+    when run on a real platform rather than offscreen.
+    """
+    ratio = 2
+    logical = QRect(0, 0, 2 * 2560, 1440)
+    device = QRect(0, 0, logical.width() * ratio, logical.height() * ratio)
+    cutout = QRect(0, 700 * ratio, device.width(), 50 * ratio)
+    moved = cutout.translated(0, 50 * ratio)
+    color_hex = AppSettings.COLORS['Black']
+    band = moved.united(cutout)
+
+    # Translucent: ARGB buffer, cleared and alpha-blended (Qt clears it before painting)
+    translucent = QImage(device.width(), device.height(), QImage.Format_ARGB32_Premultiplied)
+
+    def translucent_full(painter):
+        painter.setCompositionMode(QPainter.CompositionMode_Source)
+        painter.fillRect(device, QColor(0, 0, 0, 0))
+        painter.setCompositionMode(QPainter.CompositionMode_SourceOver)
+        paint_overlay(painter, device, color_hex, 0.5, moved)
+
+    def translucent_move(painter):
+        painter.setClipRect(band)
+        translucent_full(painter)
+
+    # Shaped: opaque buffer, plain fill; the cutout is the window mask
+    shaped = QImage(device.width(), device.height(), QImage.Format_RGB32)
+
+    def shaped_full(painter):
+        paint_overlay_shaped(painter, device, color_hex)
+
+    def shaped_move(painter):
+        # Only the strip uncovered by the old cutout is exposed
+        paint_overlay_shaped(painter, QRegion(cutout).subtracted(QRegion(moved)).boundingRect(), color_hex)
+
+    mib = device.width() * device.height() * 4 / (1024 * 1024)
+    print(f"Overlay {logical.width()}x{logical.height()} at {ratio}x: "
+          f"{device.width()}x{device.height()} device pixels")
+    print(f"  backing store: {mib:.1f} MiB in both modes (4 bytes per device pixel)")
+    rows = [
+        ("full paint, translucent", time_paint(translucent, translucent_full, repeats)),
+        ("full paint, shaped", time_paint(shaped, shaped_full, repeats)),
+        ("ruler move, translucent", time_paint(translucent, translucent_move, repeats)),
+        ("ruler move, shaped", time_paint(shaped, shaped_move, repeats)),
+    ]
+    for label, ms in rows:
+        print(f"  {label:<25} {ms:8.2f} ms")
+
+    platform = QApplication.platformName()
+    mask_ms = time_mask_updates(logical, QRect(0, 700, logical.width() // 2, 50), repeats)
+    print(f"  {'mask update, shaped':<25} {mask_ms:8.2f} ms per ruler move ({platform})")
+    if platform == 'offscreen':
+        print("  Offscreen this only times building the region; on Windows run with "
+              "QT_QPA_PLATFORM=windows to include SetWindowRgn.")
+
+
+def time_mask_updates(logical, cutout, repeats):
+    """Return the mean time in ms of moving the cutout of a shown shaped overlay."""
+    overlay = CheckOverlay(True)
+    overlay.setGeometry(logical)
+    overlay.ruler_window.rect = cutout
+    overlay.refresh()
+    overlay.update_mask()
+    if QApplication.platformName() != 'offscreen':
+        # Only a shown native window has a window region to update
+        overlay.show()
+        QApplication.processEvents()
+
+    start = time.perf_counter()
+    for i in range(repeats):
+        overlay.ruler_window.rect = cutout.translated(0, (i % 2 + 1) * cutout.height())
+        overlay.update_mask()
+        QApplication.processEvents()
+    elapsed = (time.perf_counter() - start) * 1000.0 / repeats
+
+    overlay.hide()
+    return elapsed
+
+
+def main():
+    """Run the rendering check."""
+    parser = argparse.ArgumentParser(description="TextRuler golden-image rendering check")
+    parser.add_argument('--update', action='store_true', help="regenerate golden images")
+    parser.add_argument('--bench', action='store_true', help="time overlay paint paths")
+    args = parser.parse_args()
+
+    if args.bench:
+        app = QApplication(sys.argv)
+        bench()
+        app.quit()
+        return 0
+
+    if np is None and not args.update:
+        print("NumPy is required for comparing images: pip install numpy")
+        return 2
+
+    app = QApplication(sys.argv)
+
+    if args.update:
+        os.makedirs(GOLDEN_DIR, exist_ok=True)
+    start = time.perf_counter()
+    failures = []
+    heatmaps = 0
+    count = 0
+    for name, label, reference, render in iter_cases(make_overlays()):
+        if args.update:
+            # Golden images come from full renders of the reference paths only
+            if reference:
+                render().save(os.path.join(GOLDEN_DIR, f"{name}.png"))
+                count += 1
+            continue
+        count += 1
+        error, heatmap_path = compare(name, render(), label)
+        if heatmap_path:
+            heatmaps += 1
+        if error:
+            failures.append((name, error))
+            print(f"FAIL {name} [{label}]: {error}")
+
+    elapsed = time.perf_counter() - start
+    action = "Updated" if args.update else "Checked"
+    print(f"{action} {count} images in {elapsed:.2f}s, {len(failures)} failed")
+    if heatmaps:
+        print(f"{heatmaps} diff heatmaps written to {DIFF_DIR}")
+    app.quit()
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
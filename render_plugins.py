@@ -0,0 +1,231 @@
+"""Render-extension API for painting extra layers on the ruler and overlay."""
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Any, Hashable
+from PyQt5.QtCore import Qt, QObject, QRect, pyqtSignal
+from PyQt5.QtGui import QPainter, QPixmap
+
+
+class RenderPlugin(ABC):
+    """Base class for a decoration layer painted on top of a window.
+
+    Subclasses set ``name`` and ``target`` ('ruler' or 'overlay'), implement
+    ``paint`` and return everything their output depends on from
+    ``invalidation_key``. The output is cached as a pixmap and only
+    repainted when that key or the layer size changes.
+
+    A layer covers the whole window, except for overlay plugins with a
+    ``cutout_margin``: their layer is only the ruler cutout grown by the
+    margin. It moves with the ruler without being repainted, and ``paint``
+    gets it in layer coordinates, so the cutout is ``rect`` shrunk by the
+    margin.
+
+    Example:
+        class TickMarks(RenderPlugin):
+            name = 'tick_marks'
+            target = 'ruler'
+
+            def invalidation_key(self, context):
+                return (context['width'], self.degraded)
+
+            def paint(self, painter, rect, context):
+                step = 40 if self.degraded else 10
+                for x in range(0, rect.width(), step):
+                    painter.drawLine(x, 0, x, 6)
+    """
+
+    name = 'plugin'
+    target = 'ruler'
+    budget_ms = 4.0  # Per-frame paint budget
+    cutout_margin = 0  # How far around the ruler cutout an overlay plugin draws
+
+    def __init__(self):
+        self.degraded = False
+
+    def invalidation_key(self, context: Dict[str, Any]) -> Hashable:
+        """Return a hashable value; the cached layer is reused while it is unchanged."""
+        return None
+
+    def layer_rect(self, rect, context: Dict[str, Any]) -> QRect:
+        """Return the area of the window rect the layer covers."""
+        if self.target == 'overlay' and self.cutout_margin:
+            cutout = context.get('cutout')
+            if cutout is None:
+                return QRect()
+            margin = self.cutout_margin
+            return cutout.adjusted(-margin, -margin, margin, margin)
+        return rect
+
+    @abstractmethod
+    def paint(self, painter, rect, context: Dict[str, Any]) -> None:
+        """Paint the layer into rect, given in layer coordinates."""
+
+    def set_degraded(self, degraded: bool) -> None:
+        """Switch to a cheaper rendering mode; plugins may override."""
+        self.degraded = degraded
+
+
+class RenderPluginManager(QObject):
+    """Paints registered plugins and enforces their per-frame budgets."""
+
+    # Plugin states
+    ACTIVE = 'active'
+    DEGRADED = 'degraded'
+    DISABLED = 'disabled'
+
+    # Emitted as (plugin name, new state) when the watchdog steps in
+    plugin_state_changed = pyqtSignal(str, str)
+
+    # Consecutive over-budget frames before stepping down one state
+    STRIKE_LIMIT = 3
+
+    def __init__(self):
+        super().__init__()
+        self.plugins = []
+        self.state = {}
+        self.cache = {}    # name -> (key, QPixmap)
+        self.stats = {}
+        self.strikes = {}
+        self.paused = False  # Set by the power policy; no layers are painted
+
+    def register(self, plugin: RenderPlugin) -> None:
+        """Add a plugin; it is painted after the ones already registered."""
+        if plugin.target not in ('ruler', 'overlay'):
+            raise ValueError(f"Unknown render target: {plugin.target}")
+        if plugin.name in self.state:
+            raise ValueError(f"A render plugin named {plugin.name!r} is already registered")
+        self.plugins.append(plugin)
+        self.state[plugin.name] = self.ACTIVE
+        self.strikes[plugin.name] = 0
+        self.stats[plugin.name] = {
+            'renders': 0,
+            'cache_hits': 0,
+            'last_ms': 0.0,
+            'avg_ms': 0.0,
+            'max_ms': 0.0
+        }
+
+    def unregister(self, name: str) -> None:
+        """Remove a plugin by name."""
+        self.plugins = [p for p in self.plugins if p.name != name]
+        for store in (self.state, self.cache, self.stats, self.strikes):
+            store.pop(name, None)
+
+    def enable(self, name: str) -> None:
+        """Re-enable a plugin at full quality and reset its watchdog strikes."""
+        for plugin in self.plugins:
+            if plugin.name == name:
+                plugin.set_degraded(False)
+                self._set_state(plugin, self.ACTIVE)
+                self.cache.pop(name, None)
+
+    def set_paused(self, paused: bool) -> None:
+        """Stop or resume painting all layers, keeping plugin states.
+
+        Paused plugins are not painted, so the watchdog cannot step them
+        down while paused. Cached layers are dropped to free their memory.
+        """
+        self.paused = paused
+        if paused:
+            self.cache.clear()
+
+    def has_plugins(self, target: str) -> bool:
+        """Return True if any enabled plugin paints on target."""
+        return not self.paused and any(
+            p.target == target and self.state[p.name] != self.DISABLED for p in self.plugins
+        )
+
+    def cutout_margin(self, target: str) -> int:
+        """Return the largest cutout margin of the enabled plugins for target."""
+        if self.paused:
+            return 0
+        return max((p.cutout_margin for p in self.plugins
+                    if p.target == target and self.state[p.name] != self.DISABLED),
+                   default=0)
+
+    def paint_layers(self, target, painter, rect, context: Dict[str, Any]) -> None:
+        """Paint all enabled plugins for target, using cached layers when valid."""
+        if self.paused:
+            return
+        for plugin in self.plugins:
+            if plugin.target != target or self.state[plugin.name] == self.DISABLED:
+                continue
+
+            try:
+                bounds = plugin.layer_rect(rect, context)
+                if bounds.isEmpty():
+                    continue
+                key = (plugin.invalidation_key(context), bounds.width(),
+                       bounds.height(), plugin.degraded)
+                cached = self.cache.get(plugin.name)
+                if cached and cached[0] == key:
+                    self.stats[plugin.name]['cache_hits'] += 1
+                    layer = cached[1]
+                else:
+                    layer = self._render_layer(plugin, painter, bounds, context)
+                    self.cache[plugin.name] = (key, layer)
+            except Exception as e:
+                print(f"Error in render plugin {plugin.name}: {e}")
+                self._set_state(plugin, self.DISABLED)
+                continue
+
+            painter.drawPixmap(bounds.topLeft(), layer)
+
+    def _render_layer(self, plugin, painter, bounds, context) -> QPixmap:
+        """Render a plugin into a transparent pixmap of the bounds' size and time it."""
+        # Allocating and clearing the pixmap is part of the frame cost
+        start = time.perf_counter()
+        ratio = painter.device().devicePixelRatioF()
+        layer = QPixmap(int(bounds.width() * ratio), int(bounds.height() * ratio))
+        layer.setDevicePixelRatio(ratio)
+        layer.fill(Qt.transparent)
+
+        layer_painter = QPainter(layer)
+        try:
+            layer_painter.setRenderHint(QPainter.Antialiasing)
+            plugin.paint(layer_painter, QRect(0, 0, bounds.width(), bounds.height()), context)
+        finally:
+            layer_painter.end()
+        elapsed_ms = (time.perf_counter() - start) * 1000.0
+
+        self._record_timing(plugin, elapsed_ms)
+        return layer
+
+    def _record_timing(self, plugin, elapsed_ms) -> None:
+        """Update timing statistics and step the plugin down if over budget."""
+        stats = self.stats[plugin.name]
+        stats['renders'] += 1
+        stats['last_ms'] = elapsed_ms
+        stats['max_ms'] = max(stats['max_ms'], elapsed_ms)
+        # Exponential moving average
+        stats['avg_ms'] += (elapsed_ms - stats['avg_ms']) * (1.0 if stats['renders'] == 1 else 0.2)
+
+        if elapsed_ms <= plugin.budget_ms:
+            self.strikes[plugin.name] = 0
+            return
+
+        self.strikes[plugin.name] += 1
+        if self.strikes[plugin.name] < self.STRIKE_LIMIT:
+            return
+
+        if self.state[plugin.name] == self.ACTIVE:
+            plugin.set_degraded(True)
+            self._set_state(plugin, self.DEGRADED)
+        else:
+            self._set_state(plugin, self.DISABLED)
+            self.cache.pop(plugin.name, None)
+
+    def _set_state(self, plugin, state) -> None:
+        """Change a plugin's state and notify listeners."""
+        self.strikes[plugin.name] = 0
+        if self.state.get(plugin.name) != state:
+            self.state[plugin.name] = state
+            self.plugin_state_changed.emit(plugin.name, state)
+
+    def get_timings(self) -> Dict[str, Dict[str, Any]]:
+        """Return per-plugin timing statistics for diagnostics."""
+        return {
+            plugin.name: dict(self.stats[plugin.name], state=self.state[plugin.name],
+                              budget_ms=plugin.budget_ms)
+            for plugin in self.plugins
+        }
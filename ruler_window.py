@@ -5,6 +5,16 @@ from PyQt5.QtGui import QPainter, QColor, QCursor
 import sys
 
 
+def paint_ruler(painter, rect, color_hex, opacity):
+    """Paint the ruler fill into rect; shared by paintEvent and render checks."""
+    # Parse hex color
+    color = QColor(color_hex)
+    color.setAlphaF(opacity)
+    
+    # Draw filled rectangle
+    painter.fillRect(rect, color)
+
+
 class RulerWindow(QWidget):
     """Transparent ruler overlay window."""
     
@@ -14,6 +24,11 @@ class RulerWindow(QWidget):
         self.dragging = False
         self.drag_start_pos = QPoint(0, 0)
         self.overlay_window = None  # Will be set by main app
+        self.session_logger = None  # Optional, set by main app
+        self.render_plugins = None  # Optional, set by main app
+        self.animator = None  # Optional, set by main app
+        self.governor = None  # Optional, set by main app
+        self.pending_height = None  # Wheel resize waiting for the next frame
         
         self.init_ui()
         self.load_settings()
@@ -34,10 +49,22 @@ class RulerWindow(QWidget):
         # Set cursor
         self.setCursor(Qt.SizeAllCursor)  # Changed to allow both horizontal and vertical dragging
         
+        # Accept arrow keys for stepping lines
+        self.setFocusPolicy(Qt.StrongFocus)
+        
         # Initial geometry will be set in load_settings()
     
     def load_settings(self):
         """Load settings and apply them."""
+        self.apply_geometry()
+        
+        if self.settings.get_ruler_visible():
+            self.show()
+        else:
+            self.hide()
+    
+    def apply_geometry(self):
+        """Apply the saved height and position."""
         height = self.settings.get_ruler_height()
         x_pos = self.settings.get_ruler_x()
         y_pos = self.settings.get_ruler_y()
@@ -57,11 +84,6 @@ class RulerWindow(QWidget):
             screen = QApplication.primaryScreen().geometry()
             self.setGeometry(screen.x(), y_pos, screen.width(), height)
             self.move(x_pos if x_pos >= screen.x() else screen.x(), y_pos)
-        
-        if self.settings.get_ruler_visible():
-            self.show()
-        else:
-            self.hide()
     
     def paintEvent(self, event):
         """Paint the ruler."""
@@ -73,12 +95,19 @@ class RulerWindow(QWidget):
         color_hex = self.settings.get_color_hex(color_name)
         opacity = self.settings.get_ruler_opacity(color_name)
         
-        # Parse hex color
-        color = QColor(color_hex)
-        color.setAlphaF(opacity)
+        paint_ruler(painter, self.rect(), color_hex, opacity)
         
-        # Draw filled rectangle
-        painter.fillRect(self.rect(), color)
+        # Extra decoration layers
+        if self.render_plugins and self.render_plugins.has_plugins('ruler'):
+            context = {
+                'color': color_name,
+                'color_hex': color_hex,
+                'opacity': opacity,
+                'width': self.width(),
+                'height': self.height(),
+                'geometry': self.geometry()
+            }
+            self.render_plugins.paint_layers('ruler', painter, self.rect(), context)
     
     def get_screen_geometry_at(self, x, y):
         """Get the geometry of the screen containing the given point."""
@@ -106,6 +135,8 @@ class RulerWindow(QWidget):
     def mousePressEvent(self, event):
         """Handle mouse press - start dragging."""
         if event.button() == Qt.LeftButton:
+            if self.animator:
+                self.animator.stop_move(self)
             self.dragging = True
             self.drag_start_pos = QPoint(
                 event.globalX() - self.x(),
@@ -116,6 +147,9 @@ class RulerWindow(QWidget):
         """Handle mouse release - stop dragging."""
         if event.button() == Qt.LeftButton:
             self.dragging = False
+            # Apply the last coalesced drag position first
+            if self.governor:
+                self.governor.flush('ruler_drag')
             # Adjust to current screen and save position
             self.adjust_to_current_screen()
             self.settings.set_ruler_x(self.x())
@@ -127,47 +161,120 @@ class RulerWindow(QWidget):
             new_x = event.globalX() - self.drag_start_pos.x()
             new_y = event.globalY() - self.drag_start_pos.y()
             
-            # Move ruler
-            self.move(new_x, new_y)
-            
-            # Check if we moved to a different screen and adjust width
-            screen_geometry = self.get_screen_geometry_at(new_x, new_y)
-            if screen_geometry and self.width() != screen_geometry.width():
-                # Adjust width to match new screen
-                adjusted_x = max(screen_geometry.x(), min(new_x, screen_geometry.x() + screen_geometry.width() - 100))
-                self.setGeometry(adjusted_x, new_y, screen_geometry.width(), self.height())
-                self.move(adjusted_x, new_y)
-            
-            # Update overlay if it exists
-            if self.overlay_window:
-                self.overlay_window.update_ruler_position()
+            # Coalesce high-rate input to the governor's frame rate
+            if self.governor:
+                self.governor.schedule('ruler_drag', lambda: self.drag_to(new_x, new_y))
+            else:
+                self.drag_to(new_x, new_y)
+    
+    def drag_to(self, new_x, new_y):
+        """Move the ruler to a drag position."""
+        # Move ruler
+        self.move(new_x, new_y)
+        
+        # Check if we moved to a different screen and adjust width
+        screen_geometry = self.get_screen_geometry_at(new_x, new_y)
+        if screen_geometry and self.width() != screen_geometry.width():
+            # Adjust width to match new screen
+            adjusted_x = max(screen_geometry.x(), min(new_x, screen_geometry.x() + screen_geometry.width() - 100))
+            self.setGeometry(adjusted_x, new_y, screen_geometry.width(), self.height())
+            self.move(adjusted_x, new_y)
+        
+        # Update overlay if it exists
+        if self.overlay_window:
+            self.overlay_window.update_ruler_position()
+        
+        if self.session_logger:
+            self.session_logger.record(self.session_logger.EVENT_MOVE, self.x(), self.y())
     
     def wheelEvent(self, event):
         """Handle mouse wheel - adjust height or change color."""
-        from PyQt5.QtCore import Qt as QtCore_Qt
-        
         modifiers = event.modifiers()
         
         if modifiers & Qt.ShiftModifier:
             # Shift + Wheel: Change color
             self.cycle_color(event.angleDelta().y() > 0)
         else:
-            # Normal wheel: Adjust height
+            # Normal wheel: Adjust height, starting from a not yet applied resize
+            height = self.pending_height if self.pending_height is not None else self.height()
             delta = event.angleDelta().y()
             if delta > 0:
-                new_height = min(self.height() + 5, 500)
+                self.pending_height = min(height + 5, 500)
             else:
-                new_height = max(self.height() - 5, 20)
-            
-            self.resize(self.width(), new_height)
-            self.settings.set_ruler_height(new_height)
-            
-            # Update overlay
-            if self.overlay_window:
-                self.overlay_window.update_ruler_position()
+                self.pending_height = max(height - 5, 20)
             
+            if self.governor:
+                self.governor.schedule('ruler_resize', self.apply_pending_height)
+            else:
+                self.apply_pending_height()
+    
+    def apply_pending_height(self):
+        """Resize the ruler to the height requested by the wheel."""
+        new_height = self.pending_height
+        self.pending_height = None
+        if new_height is None:
+            return
+        
+        self.resize(self.width(), new_height)
+        self.settings.set_ruler_height(new_height)
+        
+        if self.session_logger:
+            self.session_logger.record(self.session_logger.EVENT_RESIZE, self.x(), new_height)
+        
+        # Update overlay
+        if self.overlay_window:
+            self.overlay_window.update_ruler_position()
+        
+        self.request_repaint()
+    
+    def request_repaint(self):
+        """Repaint the ruler, at most once per governed frame."""
+        if self.governor:
+            self.governor.schedule('ruler_repaint', self.update)
+        else:
             self.update()
     
+    def keyPressEvent(self, event):
+        """Handle arrow keys - step the ruler one line up or down."""
+        if event.key() == Qt.Key_Down:
+            self.step_line(1)
+        elif event.key() == Qt.Key_Up:
+            self.step_line(-1)
+        else:
+            super().keyPressEvent(event)
+    
+    def step_line(self, direction):
+        """Move the ruler by its own height, sliding when an animator is set."""
+        if self.animator:
+            x, y = self.animator.move_target(self)
+        else:
+            x, y = self.x(), self.y()
+        
+        # Keep the ruler on its current screen
+        screen_geometry = self.get_screen_geometry_at(x, y)
+        new_y = y + direction * self.height()
+        new_y = max(screen_geometry.y(), min(new_y, screen_geometry.y() + screen_geometry.height() - self.height()))
+        
+        if self.animator:
+            self.animator.move(self, x, new_y, on_step=self.notify_overlay, on_finished=self.save_position)
+        else:
+            self.move(x, new_y)
+            self.notify_overlay()
+            self.save_position()
+    
+    def save_position(self):
+        """Persist the current position."""
+        self.settings.set_ruler_x(self.x())
+        self.settings.set_ruler_y(self.y())
+        
+        if self.session_logger:
+            self.session_logger.record(self.session_logger.EVENT_MOVE, self.x(), self.y())
+    
+    def notify_overlay(self):
+        """Let the overlay follow the ruler's position and visibility."""
+        if self.overlay_window:
+            self.overlay_window.update_ruler_position()
+    
     def cycle_color(self, forward=True):
         """Cycle through available colors."""
         colors = self.settings.get_color_list()
@@ -185,17 +292,49 @@ class RulerWindow(QWidget):
         
         new_color = colors[new_index]
         self.settings.set_ruler_color(new_color)
-        self.update()
+        self.request_repaint()
     
     def toggle_visibility(self):
         """Toggle ruler visibility."""
-        if self.isVisible():
-            self.hide()
-            self.settings.set_ruler_visible(False)
+        if self.animator:
+            visible = not self.animator.target_visible(self)
         else:
-            self.show()
-            self.settings.set_ruler_visible(True)
+            visible = not self.isVisible()
+        self.apply_visibility(visible)
+        self.settings.set_ruler_visible(visible)
+        
+        if self.session_logger:
+            if visible:
+                event = self.session_logger.EVENT_RULER_SHOWN
+            else:
+                event = self.session_logger.EVENT_RULER_HIDDEN
+            self.session_logger.record(event, self.x(), self.y())
+    
+    def apply_visibility(self, visible):
+        """Show or hide the ruler, fading when an animator is set."""
+        if self.animator:
+            # Overlay cutout follows once the fade has finished
+            self.animator.fade(self, visible, on_finished=self.notify_overlay)
+        else:
+            self.setVisible(visible)
+            self.notify_overlay()
     
     def set_overlay_window(self, overlay_window):
         """Set reference to overlay window."""
         self.overlay_window = overlay_window
+    
+    def set_session_logger(self, session_logger):
+        """Set the optional reading-session logger."""
+        self.session_logger = session_logger
+    
+    def set_render_plugins(self, render_plugins):
+        """Set the manager for extra decoration layers."""
+        self.render_plugins = render_plugins
+    
+    def set_animator(self, animator):
+        """Set the animator used for fades and line steps."""
+        self.animator = animator
+    
+    def set_governor(self, governor):
+        """Set the frame-rate governor for drag updates."""
+        self.governor = governor
@@ -0,0 +1,291 @@
+"""Reading-session logger with ring-buffer storage and pace statistics."""
+import os
+import struct
+import time
+from array import array
+from typing import Dict, Any, Iterator, Tuple
+from PyQt5.QtCore import QObject, QTimer
+
+
+class SessionLogger(QObject):
+    """Records ruler movements and toggles for reading-pace analysis.
+
+    Events are written into fixed-size arrays used as a ring buffer, so
+    recording is a handful of index assignments and memory stays bounded
+    no matter how long the session runs. A timer flushes pending events
+    to a compact binary log file in batches, away from the drag path.
+    Session statistics are kept as running aggregates, so they cover the
+    whole session rather than only what is still in the buffer.
+    """
+
+    # Event kinds
+    EVENT_MOVE = 0
+    EVENT_RESIZE = 1
+    EVENT_RULER_SHOWN = 2
+    EVENT_RULER_HIDDEN = 3
+    EVENT_OVERLAY_SHOWN = 4
+    EVENT_OVERLAY_HIDDEN = 5
+
+    # timestamp (float64), kind (uint8), x (int32), y (int32)
+    RECORD = struct.Struct('<dBii')
+
+    def __init__(self, log_file, capacity=4096, flush_interval_ms=5000,
+                 max_bytes=1024 * 1024, backup_count=3, line_height=50):
+        super().__init__()
+        self.log_file = log_file
+        self.capacity = capacity
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+
+        # Preallocated ring buffer columns
+        self.timestamps = array('d', bytes(8 * capacity))
+        self.kinds = array('B', bytes(capacity))
+        self.xs = array('i', bytes(4 * capacity))
+        self.ys = array('i', bytes(4 * capacity))
+
+        self.head = 0       # Next slot to write
+        self.count = 0      # Valid records in the buffer
+        self.pending = 0    # Records not yet written to disk
+        self.dropped = 0    # Records overwritten before they were flushed
+        self.started_at = time.time()
+        self.stats = SessionStats(line_height)
+        self.logged_height = line_height  # Ruler height as of the last record on disk
+
+        self.flush_timer = QTimer(self)
+        self.flush_timer.timeout.connect(self.flush)
+        self.flush_timer.start(flush_interval_ms)
+
+        # Start the log with the ruler height, so lines can be computed offline
+        self.record(self.EVENT_RESIZE, 0, line_height)
+
+    def record(self, kind, x=0, y=0):
+        """Append an event to the ring buffer and the running statistics."""
+        index = self.head
+        timestamp = time.time()
+        self.timestamps[index] = timestamp
+        self.kinds[index] = kind
+        self.xs[index] = x
+        self.ys[index] = y
+
+        self.head = (index + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+        if self.pending < self.capacity:
+            self.pending += 1
+        else:
+            self.dropped += 1
+        self.stats.add(timestamp, kind, x, y)
+
+    def flush(self):
+        """Write pending events to the log file in one batch."""
+        if not self.pending:
+            return
+
+        start = (self.head - self.pending) % self.capacity
+        chunk = bytearray(self.RECORD.size * self.pending)
+        pack_into = self.RECORD.pack_into
+        height = self.logged_height
+        for i in range(self.pending):
+            index = (start + i) % self.capacity
+            pack_into(
+                chunk, i * self.RECORD.size,
+                self.timestamps[index], self.kinds[index],
+                self.xs[index], self.ys[index]
+            )
+            if self.kinds[index] == self.EVENT_RESIZE and self.ys[index] > 0:
+                height = self.ys[index]
+
+        try:
+            if self._rotate_if_needed(len(chunk)):
+                # Each file starts with the ruler height, so it can be summarized on its own
+                chunk[:0] = self.RECORD.pack(
+                    self.timestamps[start], self.EVENT_RESIZE, 0, self.logged_height
+                )
+            with open(self.log_file, 'ab') as f:
+                f.write(chunk)
+            self.pending = 0
+            self.logged_height = height
+        except Exception as e:
+            print(f"Error writing session log: {e}")
+
+    def _rotate_if_needed(self, incoming_size) -> bool:
+        """Rotate log files when the current one would exceed max_bytes.
+
+        Returns True if the log was rotated.
+        """
+        try:
+            current_size = os.path.getsize(self.log_file)
+        except OSError:
+            return False
+        if current_size + incoming_size <= self.max_bytes:
+            return False
+
+        for i in range(self.backup_count - 1, 0, -1):
+            source = f"{self.log_file}.{i}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.log_file}.{i + 1}")
+        if self.backup_count > 0:
+            os.replace(self.log_file, f"{self.log_file}.1")
+        else:
+            os.remove(self.log_file)
+        return True
+
+    def set_flush_interval(self, interval_ms):
+        """Change how often pending events are written."""
+        self.flush_timer.setInterval(interval_ms)
+
+    def close(self):
+        """Stop the flush timer and write any remaining events."""
+        self.flush_timer.stop()
+        self.flush()
+
+    def summary(self) -> Dict[str, Any]:
+        """Summarize the whole session so far."""
+        summary = self.stats.summary()
+        summary['duration_seconds'] = time.time() - self.started_at
+        summary['dropped_events'] = self.dropped
+        return summary
+
+
+class SessionStats:
+    """Running reading-pace aggregates, updated in constant time per event.
+
+    Line steps are measured in ruler heights; the height is taken from
+    resize events, so lines stay correct when the ruler is resized during
+    the session.
+    """
+
+    DWELL_BIN_EDGES = (0.5, 1, 2, 5, 10, 30, 60)
+
+    def __init__(self, line_height=50):
+        self.line_height = line_height
+        self.height_recorded = False
+        self.events = 0
+        self.moves = 0
+        self.lines = 0.0
+        self.ruler_toggles = 0
+        self.overlay_toggles = 0
+        self.first_move = None
+        self.last_move = None
+        self.last_y = None
+        self.longest_pause = 0.0
+        self.dwell_counts = [0] * len(self.DWELL_BIN_EDGES)
+
+    def add(self, timestamp, kind, x, y):
+        """Fold one event into the aggregates."""
+        if kind == SessionLogger.EVENT_RESIZE:
+            # Resize events carry the new height in y. The first one is the
+            # starting height, and the height records that start each log
+            # file repeat the current height; neither is counted.
+            if y <= 0:
+                return
+            counted = self.height_recorded and y != self.line_height
+            self.height_recorded = True
+            self.line_height = y
+            if not counted:
+                return
+        self.events += 1
+        if kind == SessionLogger.EVENT_MOVE:
+            self._add_move(timestamp, y)
+        elif kind in (SessionLogger.EVENT_RULER_SHOWN, SessionLogger.EVENT_RULER_HIDDEN):
+            self.ruler_toggles += 1
+        elif kind in (SessionLogger.EVENT_OVERLAY_SHOWN, SessionLogger.EVENT_OVERLAY_HIDDEN):
+            self.overlay_toggles += 1
+
+    def _add_move(self, timestamp, y):
+        """Update travel and pause aggregates for a move event."""
+        self.moves += 1
+        if self.last_move is not None:
+            self.lines += abs(y - self.last_y) / self.line_height
+            self._add_dwell(timestamp - self.last_move)
+        else:
+            self.first_move = timestamp
+        self.last_move = timestamp
+        self.last_y = y
+
+    def _add_dwell(self, gap):
+        """Count a gap between moves in its dwell bin, if it is a pause."""
+        if gap < self.DWELL_BIN_EDGES[0]:
+            return
+        self.longest_pause = max(self.longest_pause, gap)
+        bin_index = len(self.DWELL_BIN_EDGES) - 1
+        for i, upper in enumerate(self.DWELL_BIN_EDGES[1:]):
+            if gap < upper:
+                bin_index = i
+                break
+        self.dwell_counts[bin_index] += 1
+
+    def lines_per_minute(self) -> float:
+        """Average vertical travel in ruler heights per minute of reading."""
+        if self.moves < 2:
+            return 0.0
+        minutes = (self.last_move - self.first_move) / 60.0
+        return self.lines / minutes if minutes > 0 else 0.0
+
+    def dwell_histogram(self) -> Dict[str, int]:
+        """Count pauses per duration bin; the last bin is open-ended."""
+        edges = self.DWELL_BIN_EDGES
+        labels = [f"{lo}-{hi}s" for lo, hi in zip(edges, edges[1:])]
+        labels.append(f"{edges[-1]}s+")
+        return dict(zip(labels, self.dwell_counts))
+
+    def summary(self) -> Dict[str, Any]:
+        """Return the aggregates as a dictionary."""
+        return {
+            'reading_seconds': (self.last_move - self.first_move) if self.moves > 1 else 0.0,
+            'events': self.events,
+            'moves': self.moves,
+            'lines': self.lines,
+            'ruler_toggles': self.ruler_toggles,
+            'overlay_toggles': self.overlay_toggles,
+            'lines_per_minute': self.lines_per_minute(),
+            'pauses': sum(self.dwell_counts),
+            'longest_pause_seconds': self.longest_pause,
+            'dwell_histogram': self.dwell_histogram()
+        }
+
+
+def read_session_log(log_file) -> Iterator[Tuple[float, int, int, int]]:
+    """Yield (timestamp, kind, x, y) records from a binary session log."""
+    with open(log_file, 'rb') as f:
+        data = f.read()
+    usable = len(data) - len(data) % SessionLogger.RECORD.size
+    yield from SessionLogger.RECORD.iter_unpack(data[:usable])
+
+
+def summarize_log(log_file, line_height=50, include_rotated=True) -> Dict[str, Any]:
+    """Compute session statistics from a log file and, optionally, its rotated backups."""
+    paths = [log_file]
+    if include_rotated:
+        i = 1
+        while os.path.exists(f"{log_file}.{i}"):
+            paths.insert(0, f"{log_file}.{i}")  # Oldest first
+            i += 1
+
+    stats = SessionStats(line_height)
+    for path in paths:
+        if os.path.exists(path):
+            for record in read_session_log(path):
+                stats.add(*record)
+    return stats.summary()
+
+
+def main():
+    """Print statistics for a session log."""
+    import argparse
+    import json
+    from settings import AppSettings
+
+    parser = argparse.ArgumentParser(description="Summarize a TextRuler reading-session log")
+    parser.add_argument('log_file', nargs='?', help="log file (default: the configured session log)")
+    parser.add_argument('--line-height', type=int, default=50,
+                        help="ruler height in pixels for logs that do not record it (default: 50)")
+    parser.add_argument('--no-rotated', action='store_true', help="ignore rotated backup logs")
+    args = parser.parse_args()
+
+    log_file = args.log_file or AppSettings.get_session_log_file()
+    print(json.dumps(summarize_log(log_file, args.line_height, not args.no_rotated), indent=2))
+
+
+if __name__ == '__main__':
+    main()
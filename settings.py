@@ -1,12 +1,29 @@
 """Settings management for TextRuler application."""
+import hashlib
 import json
 import os
-from typing import Dict, Any
-from PyQt5.QtCore import QSettings
+from typing import Dict, Any, Optional, Tuple
+from PyQt5.QtCore import QObject, QSettings, QTimer, QFileSystemWatcher, pyqtSignal
 
 
-class AppSettings:
-    """Manages application settings with persistence."""
+class AppSettings(QObject):
+    """Manages application settings with persistence.
+    
+    The settings file may be shared by several running instances and edited
+    by scripts. It is watched for changes, and external edits are applied
+    field by field; values that do not match the type of their default are
+    ignored. The file is recognized as our own by a hash of the bytes we
+    last wrote or read, so any other content is diffed and merged. Each
+    save first merges in other writers' changes, so only the fields changed
+    locally are written over them, and merges again if the file changed
+    before it could be replaced.
+    """
+    
+    # Emitted with the dotted paths (e.g. 'ruler.height') changed externally
+    settings_changed = pyqtSignal(list)
+    
+    RELOAD_DELAY_MS = 100
+    SAVE_ATTEMPTS = 3
     
     # Default color palette
     COLORS = {
@@ -22,11 +39,26 @@ class AppSettings:
     
     def __init__(self):
         """Initialize settings manager."""
+        super().__init__()
         self.settings_file = os.path.join(
             os.path.expanduser('~'),
             '.text_ruler_settings.json'
         )
+        self.synced_digest = None  # Hash of the file content we last wrote or read
+        self.dirty = set()  # Paths changed locally and not yet saved
         self.settings = self._load_settings()
+        
+        # Debounced saving; the delay is set by the frame governor
+        self.save_delay_ms = 0
+        self.save_timer = None
+        
+        # Watch for changes by other instances or scripts
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.fileChanged.connect(self._on_file_changed)
+        self.reload_timer = QTimer(self)
+        self.reload_timer.setSingleShot(True)
+        self.reload_timer.timeout.connect(self.reload)
+        self._watch_file()
     
     def _get_defaults(self) -> Dict[str, Any]:
         """Get default settings."""
@@ -42,80 +74,228 @@ class AppSettings:
             'overlay': {
                 'color': 'Black',
                 'visible': False,
+                'shaped_window': False,
                 'opacity_by_color': {color: 0.5 for color in self.COLORS.keys()}
             },
             'hotkeys': {
                 'toggle_ruler': 'ctrl+alt+f12',
                 'toggle_overlay': 'ctrl+alt+f11'
+            },
+            'power': {
+                'mode': 'auto'
+            },
+            'animations': {
+                'enabled': True
+            },
+            'session_log': {
+                'enabled': False,
+                'buffer_size': 4096,
+                'max_file_bytes': 1024 * 1024
             }
         }
     
     def _load_settings(self) -> Dict[str, Any]:
         """Load settings from file or return defaults."""
-        if os.path.exists(self.settings_file):
-            try:
-                with open(self.settings_file, 'r') as f:
-                    loaded = json.load(f)
-                    # Merge with defaults to handle new settings
-                    defaults = self._get_defaults()
-                    self._merge_dicts(defaults, loaded)
-                    return defaults
-            except Exception as e:
-                print(f"Error loading settings: {e}")
-                return self._get_defaults()
-        return self._get_defaults()
-    
-    def _merge_dicts(self, base: Dict, updates: Dict) -> None:
-        """Recursively merge updates into base dictionary."""
-        for key, value in updates.items():
-            if key in base and isinstance(base[key], dict) and isinstance(value, dict):
-                self._merge_dicts(base[key], value)
+        values, digest = self._read_file()
+        self.synced_digest = digest
+        # Start from defaults to handle new settings
+        settings = self._get_defaults()
+        for path, value in (values or {}).items():
+            self._set_path(settings, path, value)
+        return settings
+    
+    def _read_file(self) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """Read the valid settings in the file as {'section.key': value}, and its hash.
+        
+        Returns (None, digest) when the content is unchanged since our last
+        sync, so unchanged files are not parsed again.
+        """
+        if not os.path.exists(self.settings_file):
+            return None, None
+        try:
+            with open(self.settings_file, 'rb') as f:
+                raw = f.read()
+            digest = hashlib.sha1(raw).hexdigest()
+            if digest == self.synced_digest:
+                return None, digest
+            loaded = json.loads(raw.decode('utf-8'))
+            return self._valid_values(loaded), digest
+        except Exception as e:
+            print(f"Error loading settings: {e}")
+            return None, self.synced_digest
+    
+    def _file_digest(self) -> Optional[str]:
+        """Return the hash of the settings file's content, or None if it is missing."""
+        try:
+            with open(self.settings_file, 'rb') as f:
+                return hashlib.sha1(f.read()).hexdigest()
+        except OSError:
+            return None
+    
+    def _valid_values(self, loaded: Any) -> Dict[str, Any]:
+        """Flatten loaded settings, skipping paths and values the app cannot use.
+        
+        Only paths that exist in the defaults are taken, and only with a
+        value of the default's type, so a typo in an edited file cannot
+        replace a whole section or hand a string to code expecting a number.
+        """
+        if not isinstance(loaded, dict):
+            print(f"Ignoring settings file that is not an object: {loaded!r}")
+            return {}
+        defaults = self._flatten(self._get_defaults())
+        values = {}
+        for path, value in self._flatten(loaded).items():
+            if path not in defaults or not self._valid_type(value, defaults[path]):
+                print(f"Ignoring invalid setting {path}: {value!r}")
+                continue
+            values[path] = value
+        return values
+    
+    @staticmethod
+    def _valid_type(value: Any, default: Any) -> bool:
+        """Return True if value has the type of default; ints may stand in for floats."""
+        if isinstance(default, bool) or isinstance(value, bool):
+            return isinstance(value, bool) and isinstance(default, bool)
+        if isinstance(default, float):
+            return isinstance(value, (int, float))
+        return isinstance(value, type(default))
+    
+    def _flatten(self, data: Dict, prefix: str = '') -> Dict[str, Any]:
+        """Flatten nested settings into {'section.key': value}."""
+        flat = {}
+        for key, value in data.items():
+            path = f"{prefix}{key}"
+            if isinstance(value, dict):
+                flat.update(self._flatten(value, f"{path}."))
             else:
-                base[key] = value
+                flat[path] = value
+        return flat
+    
+    def _set_path(self, data: Dict, path: str, value: Any) -> None:
+        """Set a dotted path in nested settings."""
+        keys = path.split('.')
+        for key in keys[:-1]:
+            data = data.setdefault(key, {})
+        data[keys[-1]] = value
+    
+    def _set(self, path: str, value: Any) -> None:
+        """Change a setting locally and schedule a save."""
+        self._set_path(self.settings, path, value)
+        self.dirty.add(path)
+        self.request_save()
+    
+    def _watch_file(self) -> None:
+        """(Re-)add the settings file to the watcher; replaced files drop out."""
+        if os.path.exists(self.settings_file) and self.settings_file not in self.watcher.files():
+            self.watcher.addPath(self.settings_file)
+    
+    def _on_file_changed(self, path) -> None:
+        """Coalesce bursts of file change notifications into one reload."""
+        self._watch_file()
+        self.reload_timer.start(self.RELOAD_DELAY_MS)
+    
+    def reload(self) -> None:
+        """Apply fields changed in the file by another writer."""
+        values, digest = self._read_file()
+        if values is None:
+            # Missing, unreadable, or unchanged since we last wrote or read it
+            return
+        self.synced_digest = digest
+        
+        current = self._flatten(self.settings)
+        changed = []
+        for path, value in values.items():
+            # Unsaved local changes win; they are merged on the next save
+            if path in self.dirty or current.get(path) == value:
+                continue
+            self._set_path(self.settings, path, value)
+            changed.append(path)
+        
+        if changed:
+            self.settings_changed.emit(changed)
     
     def save(self) -> None:
-        """Save current settings to file."""
+        """Save current settings to file, keeping other writers' changes.
+        
+        If another writer changes the file between our merge and the
+        replace, the merge is redone, up to SAVE_ATTEMPTS times; after that
+        our write wins. There is no file lock, so a write landing between
+        the final check and the replace can still be lost.
+        """
         try:
-            with open(self.settings_file, 'w') as f:
-                json.dump(self.settings, f, indent=2)
+            temp_file = f"{self.settings_file}.{os.getpid()}.tmp"
+            for attempt in range(self.SAVE_ATTEMPTS):
+                # Pick up anything another writer saved since we last synced
+                self.reload()
+                raw = json.dumps(self.settings, indent=2).encode('utf-8')
+                
+                # Write atomically so readers never see a partial file
+                with open(temp_file, 'wb') as f:
+                    f.write(raw)
+                if (self._file_digest() == self.synced_digest
+                        or attempt == self.SAVE_ATTEMPTS - 1):
+                    os.replace(temp_file, self.settings_file)
+                    break
+                os.remove(temp_file)
+            self.synced_digest = hashlib.sha1(raw).hexdigest()
+            self.dirty.clear()
+            self._watch_file()
         except Exception as e:
             print(f"Error saving settings: {e}")
     
+    def request_save(self) -> None:
+        """Save now, or after save_delay_ms if more changes may follow."""
+        if self.save_delay_ms <= 0:
+            self.save()
+            return
+        if self.save_timer is None:
+            self.save_timer = QTimer()
+            self.save_timer.setSingleShot(True)
+            self.save_timer.timeout.connect(self.save)
+        self.save_timer.start(self.save_delay_ms)
+    
+    def set_save_delay(self, delay_ms: int) -> None:
+        """Set how long to wait for further changes before saving."""
+        self.save_delay_ms = delay_ms
+        if delay_ms <= 0:
+            self.flush()
+    
+    def flush(self) -> None:
+        """Write any pending debounced changes."""
+        if self.save_timer is not None and self.save_timer.isActive():
+            self.save_timer.stop()
+            self.save()
+    
     # Ruler settings
     def get_ruler_height(self) -> int:
         return self.settings['ruler']['height']
     
     def set_ruler_height(self, height: int) -> None:
-        self.settings['ruler']['height'] = height
-        self.save()
+        self._set('ruler.height', height)
     
     def get_ruler_x(self) -> int:
         return self.settings['ruler'].get('x_position', 0)
     
     def set_ruler_x(self, x: int) -> None:
-        self.settings['ruler']['x_position'] = x
-        self.save()
+        self._set('ruler.x_position', x)
     
     def get_ruler_y(self) -> int:
         return self.settings['ruler']['y_position']
     
     def set_ruler_y(self, y: int) -> None:
-        self.settings['ruler']['y_position'] = y
-        self.save()
+        self._set('ruler.y_position', y)
     
     def get_ruler_color(self) -> str:
         return self.settings['ruler']['color']
     
     def set_ruler_color(self, color: str) -> None:
-        self.settings['ruler']['color'] = color
-        self.save()
+        self._set('ruler.color', color)
     
     def get_ruler_visible(self) -> bool:
         return self.settings['ruler']['visible']
     
     def set_ruler_visible(self, visible: bool) -> None:
-        self.settings['ruler']['visible'] = visible
-        self.save()
+        self._set('ruler.visible', visible)
     
     def get_ruler_opacity(self, color: str = None) -> float:
         if color is None:
@@ -125,23 +305,23 @@ class AppSettings:
     def set_ruler_opacity(self, opacity: float, color: str = None) -> None:
         if color is None:
             color = self.get_ruler_color()
-        self.settings['ruler']['opacity_by_color'][color] = opacity
-        self.save()
+        self._set(f'ruler.opacity_by_color.{color}', opacity)
     
     # Overlay settings
     def get_overlay_color(self) -> str:
         return self.settings['overlay']['color']
     
     def set_overlay_color(self, color: str) -> None:
-        self.settings['overlay']['color'] = color
-        self.save()
+        self._set('overlay.color', color)
     
     def get_overlay_visible(self) -> bool:
         return self.settings['overlay']['visible']
     
     def set_overlay_visible(self, visible: bool) -> None:
-        self.settings['overlay']['visible'] = visible
-        self.save()
+        self._set('overlay.visible', visible)
+    
+    def get_overlay_shaped(self) -> bool:
+        return self.settings['overlay']['shaped_window']
     
     def get_overlay_opacity(self, color: str = None) -> float:
         if color is None:
@@ -151,8 +331,42 @@ class AppSettings:
     def set_overlay_opacity(self, opacity: float, color: str = None) -> None:
         if color is None:
             color = self.get_overlay_color()
-        self.settings['overlay']['opacity_by_color'][color] = opacity
-        self.save()
+        self._set(f'overlay.opacity_by_color.{color}', opacity)
+    
+    # Power settings
+    def get_power_mode(self) -> str:
+        return self.settings['power']['mode']
+    
+    def set_power_mode(self, mode: str) -> None:
+        self._set('power.mode', mode)
+    
+    # Animation settings
+    def get_animations_enabled(self) -> bool:
+        return self.settings['animations']['enabled']
+    
+    def set_animations_enabled(self, enabled: bool) -> None:
+        self._set('animations.enabled', enabled)
+    
+    # Session log settings
+    def get_session_log_enabled(self) -> bool:
+        return self.settings['session_log']['enabled']
+    
+    def set_session_log_enabled(self, enabled: bool) -> None:
+        self._set('session_log.enabled', enabled)
+    
+    def get_session_log_buffer_size(self) -> int:
+        return self.settings['session_log']['buffer_size']
+    
+    def get_session_log_max_bytes(self) -> int:
+        return self.settings['session_log']['max_file_bytes']
+    
+    @staticmethod
+    def get_session_log_file() -> str:
+        """Return the path of the binary session log."""
+        return os.path.join(
+            os.path.expanduser('~'),
+            '.text_ruler_session.log'
+        )
     
     def get_color_list(self):
         """Return list of available color names."""
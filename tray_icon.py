@@ -14,6 +14,22 @@ class TrayIcon(QObject):
     exit_requested = pyqtSignal()
     ruler_color_changed = pyqtSignal(str)
     overlay_color_changed = pyqtSignal(str)
+    power_mode_changed = pyqtSignal(str)
+    
+    POWER_MODE_LABELS = {
+        'auto': 'Automatic',
+        'performance': 'Performance',
+        'power_saver': 'Power Saver'
+    }
+    
+    # Governed update paths, as shown in the power menu
+    UPDATE_PATH_LABELS = {
+        'ruler_drag': 'Ruler drag',
+        'ruler_resize': 'Ruler resize',
+        'ruler_repaint': 'Ruler repaint',
+        'overlay_repaint': 'Cutout repaint',
+        'overlay_refresh': 'Overlay repaint'
+    }
     
     def __init__(self, settings):
         super().__init__()
@@ -23,6 +39,12 @@ class TrayIcon(QObject):
         
         self.ruler_color_actions = {}
         self.overlay_color_actions = {}
+        self.power_mode_actions = {}
+        self.power_menu = None
+        self.power_status_action = None
+        self.power_rates_separator = None
+        self.power_rate_actions = []
+        self.power_status_provider = None  # Callable returning governor status
     
     def create_tray_icon(self):
         """Create and show the system tray icon."""
@@ -98,6 +120,28 @@ class TrayIcon(QObject):
         
         self.menu.addMenu(overlay_color_menu)
         
+        # Power Mode submenu
+        power_menu = QMenu("Power Mode", self.menu)
+        self.power_menu = power_menu
+        current_power_mode = self.settings.get_power_mode()
+        
+        # Status and per-path rates, filled in when the menu opens
+        self.power_status_action = QAction("", power_menu)
+        self.power_status_action.setEnabled(False)
+        power_menu.addAction(self.power_status_action)
+        self.power_rates_separator = power_menu.addSeparator()
+        
+        for mode, label in self.POWER_MODE_LABELS.items():
+            action = QAction(label, power_menu)
+            action.setCheckable(True)
+            action.setChecked(mode == current_power_mode)
+            action.triggered.connect(lambda checked, m=mode: self.on_power_mode_changed(m))
+            power_menu.addAction(action)
+            self.power_mode_actions[mode] = action
+        
+        power_menu.aboutToShow.connect(self.update_power_status)
+        self.menu.addMenu(power_menu)
+        
         self.menu.addSeparator()
         
         # Exit
@@ -124,6 +168,43 @@ class TrayIcon(QObject):
         
         self.overlay_color_changed.emit(color)
     
+    def on_power_mode_changed(self, mode):
+        """Handle power mode change from menu."""
+        for m, action in self.power_mode_actions.items():
+            action.setChecked(m == mode)
+        
+        self.power_mode_changed.emit(mode)
+    
+    def update_power_status(self):
+        """Show the active policy and the rate of each path's last burst of updates."""
+        if not self.power_status_action or not self.power_status_provider:
+            return
+        status = self.power_status_provider()
+        source = "Battery" if status['on_battery'] else "AC power"
+        policy = self.POWER_MODE_LABELS.get(status['policy'], status['policy'])
+        self.power_status_action.setText(f"{source}: {policy}, up to {status['max_fps']} fps")
+        
+        for action in self.power_rate_actions:
+            self.power_menu.removeAction(action)
+            action.deleteLater()
+        self.power_rate_actions = []
+        
+        rates = status['burst_rates']
+        lines = [
+            f"Last {self.UPDATE_PATH_LABELS.get(key, key).lower()}: {rate:.0f} fps"
+            for key, rate in sorted(rates.items())
+        ] or ["No drag or repaint measured yet"]
+        for text in lines:
+            action = QAction(text, self.power_menu)
+            action.setEnabled(False)
+            self.power_menu.insertAction(self.power_rates_separator, action)
+            self.power_rate_actions.append(action)
+    
+    def update_power_mode(self, mode):
+        """Update power mode checkmarks."""
+        for m, action in self.power_mode_actions.items():
+            action.setChecked(m == mode)
+    
     def update_ruler_state(self, visible):
         """Update ruler toggle state in menu."""
         if self.toggle_ruler_action:
@@ -0,0 +1,149 @@
+"""Window-level fade and move animations."""
+import time
+from PyQt5.QtCore import Qt, QObject, QTimer, QEasingCurve
+
+
+class WindowAnimator(QObject):
+    """Animates window opacity and position without repainting content.
+
+    Fades change the native window opacity (``setWindowOpacity``) and moves
+    change the native window position, so each frame costs the same no
+    matter how large the window is. All animations share one frame-paced
+    timer that only runs while something is animating.
+    """
+
+    FRAME_INTERVAL_MS = 16
+    FADE_DURATION_MS = 150
+    MOVE_DURATION_MS = 120
+
+    def __init__(self, enabled=True):
+        super().__init__()
+        self.enabled = enabled
+        self.animations = {}  # (widget, kind) -> animation state
+        self.easing = QEasingCurve(QEasingCurve.OutCubic)
+
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.setInterval(self.FRAME_INTERVAL_MS)
+        self.timer.timeout.connect(self._tick)
+
+    def set_frame_interval(self, interval_ms):
+        """Set the time between animation frames."""
+        self.timer.setInterval(max(self.FRAME_INTERVAL_MS, interval_ms))
+
+    def is_animating(self) -> bool:
+        """Return True while any animation is running."""
+        return bool(self.animations)
+
+    def target_visible(self, widget) -> bool:
+        """Return the visibility the widget is heading to, including running fades."""
+        fade = self.animations.get((widget, 'fade'))
+        if fade:
+            return fade['end'] > 0.0
+        return widget.isVisible()
+
+    def is_fading(self, widget) -> bool:
+        """Return True while the widget's opacity is being animated."""
+        return (widget, 'fade') in self.animations
+
+    def fade(self, widget, visible, opacity=1.0, on_finished=None):
+        """Fade the widget in to opacity, or out and hide it, restoring opacity."""
+        if visible:
+            if not widget.isVisible():
+                widget.setWindowOpacity(0.0)
+                widget.show()
+            end = opacity
+
+            def finished():
+                if on_finished:
+                    on_finished()
+        else:
+            end = 0.0
+
+            def finished():
+                widget.hide()
+                widget.setWindowOpacity(opacity)
+                if on_finished:
+                    on_finished()
+
+        self._start(
+            (widget, 'fade'),
+            widget.windowOpacity(),
+            end,
+            self.FADE_DURATION_MS,
+            widget.setWindowOpacity,
+            finished
+        )
+
+    def move(self, widget, x, y, on_step=None, on_finished=None):
+        """Slide the widget to (x, y), calling on_step after every frame."""
+        def apply(value):
+            widget.move(int(round(value[0])), int(round(value[1])))
+            if on_step:
+                on_step()
+
+        self._start(
+            (widget, 'move'),
+            (widget.x(), widget.y()),
+            (x, y),
+            self.MOVE_DURATION_MS,
+            apply,
+            on_finished
+        )
+
+    def move_target(self, widget):
+        """Return the (x, y) the widget is heading to, or its current position."""
+        move = self.animations.get((widget, 'move'))
+        if move:
+            return move['end']
+        return widget.x(), widget.y()
+
+    def stop_move(self, widget):
+        """Cancel a running move, leaving the widget where it is."""
+        self.animations.pop((widget, 'move'), None)
+
+    def _start(self, key, start, end, duration_ms, apply, on_finished):
+        """Register an animation, replacing any running one with the same key."""
+        if not self.enabled or duration_ms <= 0:
+            self.animations.pop(key, None)
+            apply(end)
+            if on_finished:
+                on_finished()
+            return
+
+        self.animations[key] = {
+            'started': time.monotonic(),
+            'duration': duration_ms / 1000.0,
+            'start': start,
+            'end': end,
+            'apply': apply,
+            'on_finished': on_finished
+        }
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def _tick(self):
+        """Advance all running animations by one frame."""
+        now = time.monotonic()
+        finished = []
+        for key, animation in list(self.animations.items()):
+            progress = min((now - animation['started']) / animation['duration'], 1.0)
+            eased = self.easing.valueForProgress(progress)
+            animation['apply'](self._interpolate(animation['start'], animation['end'], eased))
+            if progress >= 1.0:
+                del self.animations[key]
+                finished.append(animation['on_finished'])
+
+        if not self.animations:
+            self.timer.stop()
+
+        for on_finished in finished:
+            if on_finished:
+                on_finished()
+
+    @staticmethod
+    def _interpolate(start, end, t):
+        """Linearly interpolate scalars or tuples."""
+        if isinstance(start, tuple):
+            return tuple(a + (b - a) * t for a, b in zip(start, end))
+        return start + (end - start) * t